@@ -1,8 +1,10 @@
 import asyncio
+from types import SimpleNamespace
 
 import httpx
 import pytest
 
+import wf_market_analyzer
 from wf_market_analyzer import (
     AnalysisReport,
     RuntimeConfig,
@@ -153,6 +155,14 @@ async def immediate_sleep(_: float) -> None:
     return None
 
 
+class FakeClock:
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
 def run(coro):
     return asyncio.run(coro)
 
@@ -200,10 +210,13 @@ def test_client_sends_identifying_user_agent():
 
 def test_client_honors_retry_after_header_on_429(monkeypatch):
     recorded_delays: list[float] = []
+    clock = FakeClock()
 
     async def recording_sleep(delay: float) -> None:
         recorded_delays.append(delay)
+        clock.now += delay
 
+    monkeypatch.setattr(wf_market_analyzer, "time", SimpleNamespace(monotonic=clock.monotonic))
     monkeypatch.setattr("wf_market_analyzer.asyncio.sleep", recording_sleep)
 
     attempts = {"count": 0}
@@ -232,10 +245,13 @@ def test_client_honors_retry_after_header_on_429(monkeypatch):
 
 def test_client_caps_hostile_retry_after_header(monkeypatch):
     recorded_delays: list[float] = []
+    clock = FakeClock()
 
     async def recording_sleep(delay: float) -> None:
         recorded_delays.append(delay)
+        clock.now += delay
 
+    monkeypatch.setattr(wf_market_analyzer, "time", SimpleNamespace(monotonic=clock.monotonic))
     monkeypatch.setattr("wf_market_analyzer.asyncio.sleep", recording_sleep)
 
     attempts = {"count": 0}
@@ -523,3 +539,112 @@ def test_analyzer_raises_when_metadata_is_invalid():
     assert report.metadata_set_count == 1
     assert report.skipped_invalid_set_count == 1
     assert report.results[0].set_data.slug == "beta_prime_set"
+
+
+def test_client_deferral_applies_to_callers_already_waiting(monkeypatch):
+    real_sleep = asyncio.sleep
+    clock = FakeClock()
+    first_sleep_started = asyncio.Event()
+    deferral_applied = asyncio.Event()
+    sleep_calls = 0
+
+    async def fake_sleep(delay: float) -> None:
+        nonlocal sleep_calls
+        sleep_calls += 1
+        if sleep_calls == 1:
+            first_sleep_started.set()
+            await deferral_applied.wait()
+        clock.now += delay
+        await real_sleep(0)
+
+    monkeypatch.setattr(wf_market_analyzer, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr("wf_market_analyzer.asyncio.sleep", fake_sleep)
+    settings = RuntimeConfig(requests_per_second=5.0, max_retries=1, debug=False)
+    started: list[float] = []
+
+    async def scenario():
+        client = WarframeMarketClient(settings, transport=httpx.MockTransport(lambda _: None))
+
+        async def paced_request() -> None:
+            await client._rate_limit()
+            started.append(clock.now)
+
+        try:
+            await paced_request()
+            waiters = [asyncio.create_task(paced_request()) for _ in range(3)]
+            await first_sleep_started.wait()
+            client._defer_requests(2.0)
+            deferral_applied.set()
+            await asyncio.gather(*waiters)
+        finally:
+            await client.close()
+
+    run(scenario())
+
+    assert started[0] == 100.0
+    assert started[1:] == [
+        pytest.approx(102.0),
+        pytest.approx(102.2),
+        pytest.approx(102.4),
+    ]
+
+
+def test_analyzer_fetch_all_preserves_order_when_responses_overlap():
+    settings = RuntimeConfig(requests_per_second=1000.0, max_retries=1, debug=False)
+    slugs = ["slow", "medium", "fast"]
+    finished: list[str] = []
+
+    async def scenario():
+        released = {slug: asyncio.Event() for slug in slugs}
+
+        async def fetch(slug: str) -> str:
+            await released[slug].wait()
+            finished.append(slug)
+            return slug.upper()
+
+        analyzer = SetProfitAnalyzer(settings, transport=httpx.MockTransport(lambda _: None))
+        try:
+            fetch_task = asyncio.create_task(
+                analyzer._fetch_all("items", slugs, fetch, log_every=1)
+            )
+            for slug in reversed(slugs):
+                released[slug].set()
+                while slug not in finished:
+                    await asyncio.sleep(0)
+            return await fetch_task
+        finally:
+            await analyzer.client.close()
+
+    assert run(scenario()) == ["SLOW", "MEDIUM", "FAST"]
+    assert finished == ["fast", "medium", "slow"]
+
+
+def test_analyzer_fetch_all_cancels_pending_fetches_when_one_fails():
+    settings = RuntimeConfig(requests_per_second=1000.0, max_retries=1, debug=False)
+    slugs = ["ok", "broken", "pending"]
+    cancelled: list[str] = []
+
+    async def scenario():
+        never_released = asyncio.Event()
+
+        async def fetch(slug: str) -> str:
+            if slug == "broken":
+                raise RuntimeError("fetch failed")
+            if slug == "pending":
+                try:
+                    await never_released.wait()
+                except asyncio.CancelledError:
+                    cancelled.append(slug)
+                    raise
+            return slug
+
+        analyzer = SetProfitAnalyzer(settings, transport=httpx.MockTransport(lambda _: None))
+        try:
+            with pytest.raises(RuntimeError, match="fetch failed"):
+                await analyzer._fetch_all("items", slugs, fetch, log_every=1)
+            # Siblings are already settled when the error reaches the caller.
+            assert cancelled == ["pending"]
+        finally:
+            await analyzer.client.close()
+
+    run(scenario())
@@ -2,6 +2,7 @@ import csv
 from datetime import datetime
 
 from wf_market_analyzer import (
+    CSV_FIELDNAMES,
     PriceData,
     ResultRow,
     SetData,
@@ -99,6 +100,28 @@ def test_write_results_to_csv_writes_expected_columns_atomically(tmp_path):
     )
 
 
+def test_write_results_to_csv_aligns_values_with_header(tmp_path):
+    output_path = tmp_path / "aligned.csv"
+
+    write_results_to_csv([sample_result()], output_path)
+
+    with output_path.open(newline="", encoding="utf-8") as handle:
+        header, row = list(csv.reader(handle))
+
+    assert tuple(header) == CSV_FIELDNAMES
+    assert dict(zip(header, row)) == {
+        "Run Timestamp": "2026-03-05T14:15:16-05:00",
+        "Set Name": "Alpha Prime Set",
+        "Set Slug": "alpha_prime_set",
+        "Profit": "88.0",
+        "Set Selling Price": "105.0",
+        "Part Costs Total": "17.0",
+        "Volume (48h)": "12",
+        "Score": "0.8123",
+        "Part Prices": "Alpha Prime Blueprint (x1): 11.0; alpha_prime_barrel (x2): 3.0",
+    }
+
+
 def test_write_results_to_csv_preserves_row_order(tmp_path):
     output_path = tmp_path / "ordered.csv"
     rows = [
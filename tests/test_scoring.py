@@ -11,6 +11,7 @@ from wf_market_analyzer import (
     SetData,
     VolumeData,
     bool_arg,
+    build_connection_limits,
     build_request_headers,
     calculate_average_sell_price,
     env_var_name,
@@ -21,6 +22,7 @@ from wf_market_analyzer import (
     non_empty_string,
     non_negative_finite_float,
     non_negative_int,
+    parse_required_int,
     parse_required_non_negative_int,
     parse_required_positive_int,
     parse_retry_after_seconds,
@@ -66,6 +68,14 @@ def test_generate_run_id_and_build_request_headers():
     }
 
 
+def test_build_connection_limits_outlives_slowest_request_interval():
+    limits = build_connection_limits()
+
+    assert limits.max_connections == limits.max_keepalive_connections
+    # requests_per_second is clamped to 0.1, so requests are at most 10s apart.
+    assert limits.keepalive_expiry == 30.0
+
+
 def test_run_id_filter_injects_run_id():
     record = logging.LogRecord("wf", logging.INFO, __file__, 1, "hello", (), None)
 
@@ -88,6 +98,14 @@ def test_safe_float(value, default, expected):
     assert safe_float(value, default=default) == expected
 
 
+@pytest.mark.parametrize(
+    ("value", "minimum", "expected"),
+    [("3", 2, 3), ("2", 2, 2), ("1", 2, None), ("2.5", 0, None), (None, 0, None)],
+)
+def test_parse_required_int_enforces_minimum(value, minimum, expected):
+    assert parse_required_int(value, minimum=minimum) == expected
+
+
 @pytest.mark.parametrize(
     ("value", "expected"),
     [("2", 2), ("2.0", 2), (1, 1), ("0", None), ("-1", None), ("bad", None)],
@@ -10,15 +10,18 @@ import json
 import logging
 import math
 import os
+import statistics
 import sys
 import tempfile
 import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import chain
 from logging.handlers import RotatingFileHandler
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Callable, Sequence
+from typing import Any, Awaitable, Callable, Sequence, TypeVar
 
 import httpx
 
@@ -50,10 +53,27 @@ from config import (
 )
 
 logger = logging.getLogger("wf_market_analyzer")
+T = TypeVar("T")
 TOP_ORDER_SAMPLE_LIMIT = 5
 RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504, 509}
 RETRY_AFTER_CAP_SECONDS = 60.0
 ERROR_BODY_LOG_LIMIT = 500
+HTTP_POOL_SIZE = 8
+HTTP_KEEPALIVE_EXPIRY_SECONDS = 30.0
+LOG_LEVELS = frozenset({"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"})
+TRUTHY_STRINGS = frozenset({"1", "true", "yes", "on"})
+FALSY_STRINGS = frozenset({"0", "false", "no", "off"})
+CSV_FIELDNAMES = (
+    "Run Timestamp",
+    "Set Name",
+    "Set Slug",
+    "Profit",
+    "Set Selling Price",
+    "Part Costs Total",
+    "Volume (48h)",
+    "Score",
+    "Part Prices",
+)
 
 
 def generate_run_id() -> str:
@@ -62,6 +82,16 @@ def generate_run_id() -> str:
     return uuid.uuid4().hex[:8]
 
 
+def build_connection_limits() -> httpx.Limits:
+    """Size the HTTP pool so idle connections survive the slowest request pace."""
+
+    return httpx.Limits(
+        max_connections=HTTP_POOL_SIZE,
+        max_keepalive_connections=HTTP_POOL_SIZE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+
 def build_request_headers(platform: str, language: str, crossplay: bool) -> dict[str, str]:
     """Build request headers from the resolved runtime configuration."""
 
@@ -233,22 +263,25 @@ def safe_float(value: Any, default: float = 0.0) -> float:
     return parsed
 
 
-def parse_required_positive_int(value: Any) -> int | None:
-    """Parse a required positive integer-like value."""
+def parse_required_int(value: Any, minimum: int) -> int | None:
+    """Parse a required integer-like value that is at least the given minimum."""
 
     parsed = safe_float(value, default=math.nan)
-    if not math.isfinite(parsed) or parsed <= 0 or not parsed.is_integer():
+    if not math.isfinite(parsed) or parsed < minimum or not parsed.is_integer():
         return None
     return int(parsed)
 
 
+def parse_required_positive_int(value: Any) -> int | None:
+    """Parse a required positive integer-like value."""
+
+    return parse_required_int(value, minimum=1)
+
+
 def parse_required_non_negative_int(value: Any) -> int | None:
     """Parse a required non-negative integer-like value."""
 
-    parsed = safe_float(value, default=math.nan)
-    if not math.isfinite(parsed) or parsed < 0 or not parsed.is_integer():
-        return None
-    return int(parsed)
+    return parse_required_int(value, minimum=0)
 
 
 def parse_retry_after_seconds(value: str | None) -> float | None:
@@ -322,8 +355,7 @@ def calculate_average_sell_price(
         return None
 
     take_count = min(required_sample_size, len(valid_prices))
-    selected = valid_prices[:take_count]
-    return sum(selected) / len(selected)
+    return statistics.fmean(valid_prices[:take_count])
 
 
 def score_results(
@@ -347,15 +379,14 @@ def score_results(
     profit_range = max_profit - min_profit
     volume_range = max_volume - min_volume
 
-    for row in results:
-        normalized_profit = 0.0
-        normalized_volume = 0.0
-
-        if profit_range > 0:
-            normalized_profit = (row.price_data.profit - min_profit) / profit_range
-        if volume_range > 0:
-            normalized_volume = (row.volume_data.volume_48h - min_volume) / volume_range
+    # A zero range means every value equals the minimum, so dividing by 1.0
+    # still yields 0.0 and the per-row loop needs no range checks.
+    profit_divisor = profit_range if profit_range > 0 else 1.0
+    volume_divisor = volume_range if volume_range > 0 else 1.0
 
+    for row in results:
+        normalized_profit = (row.price_data.profit - min_profit) / profit_divisor
+        normalized_volume = (row.volume_data.volume_48h - min_volume) / volume_divisor
         row.score = (
             normalized_profit * profit_weight
             + normalized_volume * volume_weight
@@ -403,17 +434,6 @@ def write_results_to_csv(results: list[ResultRow], output_path: Path) -> None:
     """Write ranked results to a CSV file atomically."""
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [
-        "Run Timestamp",
-        "Set Name",
-        "Set Slug",
-        "Profit",
-        "Set Selling Price",
-        "Part Costs Total",
-        "Volume (48h)",
-        "Score",
-        "Part Prices",
-    ]
 
     temp_path: Path | None = None
     try:
@@ -427,23 +447,22 @@ def write_results_to_csv(results: list[ResultRow], output_path: Path) -> None:
             delete=False,
         ) as handle:
             temp_path = Path(handle.name)
-            writer = csv.DictWriter(handle, fieldnames=fieldnames)
+            writer = csv.DictWriter(handle, fieldnames=CSV_FIELDNAMES)
             writer.writeheader()
-
-            for result in results:
-                writer.writerow(
-                    {
-                        "Run Timestamp": result.run_timestamp,
-                        "Set Name": result.set_data.name,
-                        "Set Slug": result.set_data.slug,
-                        "Profit": f"{result.price_data.profit:.1f}",
-                        "Set Selling Price": f"{result.price_data.set_price:.1f}",
-                        "Part Costs Total": f"{result.price_data.total_part_cost:.1f}",
-                        "Volume (48h)": result.volume_data.volume_48h,
-                        "Score": f"{result.score:.4f}",
-                        "Part Prices": format_part_prices(result),
-                    }
-                )
+            writer.writerows(
+                {
+                    "Run Timestamp": result.run_timestamp,
+                    "Set Name": result.set_data.name,
+                    "Set Slug": result.set_data.slug,
+                    "Profit": f"{result.price_data.profit:.1f}",
+                    "Set Selling Price": f"{result.price_data.set_price:.1f}",
+                    "Part Costs Total": f"{result.price_data.total_part_cost:.1f}",
+                    "Volume (48h)": result.volume_data.volume_48h,
+                    "Score": f"{result.score:.4f}",
+                    "Part Prices": format_part_prices(result),
+                }
+                for result in results
+            )
 
         temp_path.replace(output_path)
     except Exception:
@@ -457,13 +476,15 @@ class WarframeMarketClient:
 
     def __init__(self, settings: RuntimeConfig, transport: Any = None):
         self.settings = settings
+        self._last_request_time = 0.0
+        self._request_interval = 1.0 / max(settings.requests_per_second, 0.1)
+        self._rate_lock = asyncio.Lock()
         self._client = httpx.AsyncClient(
             headers=settings.headers,
             timeout=settings.request_timeout_seconds,
+            limits=build_connection_limits(),
             transport=transport,
         )
-        self._last_request_time = 0.0
-        self._request_interval = 1.0 / max(settings.requests_per_second, 0.1)
 
     async def close(self) -> None:
         """Close the underlying HTTP client."""
@@ -471,13 +492,24 @@ class WarframeMarketClient:
         await self._client.aclose()
 
     async def _rate_limit(self) -> None:
-        """Respect the configured global request pace."""
+        """Respect the configured global request pace across concurrent callers."""
+
+        async with self._rate_lock:
+            # Re-check after every sleep: _defer_requests may push the deadline
+            # forward while this caller is waiting.
+            while True:
+                now = time.monotonic()
+                wait_seconds = self._last_request_time + self._request_interval - now
+                if wait_seconds <= 0:
+                    break
+                await asyncio.sleep(wait_seconds)
+            self._last_request_time = now
+
+    def _defer_requests(self, delay: float) -> None:
+        """Hold back every pending request, not only the one being retried."""
 
-        now = time.monotonic()
-        elapsed = now - self._last_request_time
-        if elapsed < self._request_interval:
-            await asyncio.sleep(self._request_interval - elapsed)
-        self._last_request_time = time.monotonic()
+        resume_at = time.monotonic() + delay - self._request_interval
+        self._last_request_time = max(self._last_request_time, resume_at)
 
     async def _get_json(self, url: str) -> dict[str, Any] | None:
         """Fetch JSON with retries for transient failures."""
@@ -526,6 +558,7 @@ class WarframeMarketClient:
                 delay = backoff_seconds
                 if retry_after is not None:
                     delay = max(retry_after, backoff_seconds)
+                    self._defer_requests(delay)
                 await asyncio.sleep(delay)
                 backoff_seconds *= 2
                 continue
@@ -688,19 +721,54 @@ class SetProfitAnalyzer:
         finally:
             await self.client.close()
 
+    async def _fetch_all(
+        self,
+        label: str,
+        slugs: list[str],
+        fetch: Callable[[str], Awaitable[T]],
+        log_every: int,
+    ) -> list[T]:
+        """Fetch one resource per slug concurrently, preserving input order.
+
+        The client still paces request starts globally; this only lets
+        responses overlap instead of waiting for each round trip in turn.
+        """
+
+        semaphore = asyncio.Semaphore(HTTP_POOL_SIZE)
+        total = len(slugs)
+        completed = 0
+
+        async def fetch_one(slug: str) -> T:
+            nonlocal completed
+            async with semaphore:
+                result = await fetch(slug)
+            completed += 1
+            if completed % log_every == 0 or completed == total:
+                logger.info("Fetched %s %s/%s", label, completed, total)
+            return result
+
+        tasks = [asyncio.create_task(fetch_one(slug)) for slug in slugs]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            # A failed fetch must not leave siblings running against a client
+            # that analyze() is about to close.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _analyze(self) -> AnalysisReport:
         set_slugs = await self.client.fetch_all_prime_set_slugs()
         catalog_set_count = len(set_slugs)
         logger.info("Found %s Prime sets in the v2 catalog", catalog_set_count)
 
-        set_catalog: list[SetData] = []
-        for index, set_slug in enumerate(set_slugs, start=1):
-            set_data = await self.client.fetch_set_data(set_slug)
-            if set_data is not None:
-                set_catalog.append(set_data)
-
-            if index % 25 == 0 or index == catalog_set_count:
-                logger.info("Fetched set metadata %s/%s", index, catalog_set_count)
+        set_metadata = await self._fetch_all(
+            "set metadata",
+            set_slugs,
+            self.client.fetch_set_data,
+            log_every=25,
+        )
+        set_catalog = [set_data for set_data in set_metadata if set_data is not None]
 
         if not set_catalog:
             raise RuntimeError("No valid Prime set metadata could be loaded")
@@ -708,24 +776,38 @@ class SetProfitAnalyzer:
         metadata_set_count = len(set_catalog)
         skipped_invalid_set_count = catalog_set_count - metadata_set_count
 
-        unique_item_slugs = list(dict.fromkeys(
-            [set_data.slug for set_data in set_catalog]
-            + [part_slug for set_data in set_catalog for part_slug in set_data.parts]
-        ))
-        orderbook_prices: dict[str, list[float]] = {}
+        catalog_slugs = [set_data.slug for set_data in set_catalog]
+        unique_item_slugs = list(dict.fromkeys(chain(
+            catalog_slugs,
+            chain.from_iterable(set_data.parts for set_data in set_catalog),
+        )))
 
         logger.info("Fetching top sell prices for %s items", len(unique_item_slugs))
-        for index, item_slug in enumerate(unique_item_slugs, start=1):
-            orderbook_prices[item_slug] = await self.client.fetch_top_sell_prices(item_slug)
-            if index % 50 == 0 or index == len(unique_item_slugs):
-                logger.info("Fetched orderbooks %s/%s", index, len(unique_item_slugs))
+        item_prices = await self._fetch_all(
+            "orderbooks",
+            unique_item_slugs,
+            self.client.fetch_top_sell_prices,
+            log_every=50,
+        )
+        sample_size = self.settings.price_sample_size
+        allow_thin_orderbooks = self.settings.allow_thin_orderbooks
+        price_lookup = {
+            item_slug: calculate_average_sell_price(
+                prices,
+                sample_size,
+                allow_thin_orderbooks=allow_thin_orderbooks,
+            )
+            for item_slug, prices in zip(unique_item_slugs, item_prices)
+        }
 
-        volumes: dict[str, int | None] = {}
         logger.info("Fetching 48-hour volume for %s sets", metadata_set_count)
-        for index, set_data in enumerate(set_catalog, start=1):
-            volumes[set_data.slug] = await self.client.fetch_volume_48h(set_data.slug)
-            if index % 25 == 0 or index == metadata_set_count:
-                logger.info("Fetched set volumes %s/%s", index, metadata_set_count)
+        set_volumes = await self._fetch_all(
+            "set volumes",
+            catalog_slugs,
+            self.client.fetch_volume_48h,
+            log_every=25,
+        )
+        volumes = dict(zip(catalog_slugs, set_volumes))
 
         completed_at = datetime.now().astimezone().replace(microsecond=0)
         run_timestamp = completed_at.isoformat()
@@ -734,7 +816,7 @@ class SetProfitAnalyzer:
         skipped_missing_volume_count = 0
 
         for set_data in set_catalog:
-            price_data = self._calculate_set_profit(set_data, orderbook_prices)
+            price_data = self._calculate_set_profit(set_data, price_lookup)
             volume = volumes.get(set_data.slug)
 
             if price_data is None:
@@ -769,7 +851,7 @@ class SetProfitAnalyzer:
             profit_weight=self.settings.profit_weight,
             volume_weight=self.settings.volume_weight,
         )
-        results.sort(key=lambda row: row.score, reverse=True)
+        results.sort(key=attrgetter("score"), reverse=True)
 
         logger.info(
             "Analysis complete. Ranked %s sets (catalog=%s metadata=%s skipped_invalid=%s "
@@ -794,13 +876,9 @@ class SetProfitAnalyzer:
     def _calculate_set_profit(
         self,
         set_data: SetData,
-        orderbook_prices: dict[str, list[float]],
+        price_lookup: dict[str, float | None],
     ) -> PriceData | None:
-        set_price = calculate_average_sell_price(
-            orderbook_prices.get(set_data.slug, []),
-            self.settings.price_sample_size,
-            allow_thin_orderbooks=self.settings.allow_thin_orderbooks,
-        )
+        set_price = price_lookup.get(set_data.slug)
         if set_price is None:
             return None
 
@@ -808,11 +886,7 @@ class SetProfitAnalyzer:
         total_part_cost = 0.0
 
         for part_slug, quantity in set_data.parts.items():
-            part_price = calculate_average_sell_price(
-                orderbook_prices.get(part_slug, []),
-                self.settings.price_sample_size,
-                allow_thin_orderbooks=self.settings.allow_thin_orderbooks,
-            )
+            part_price = price_lookup.get(part_slug)
             if part_price is None:
                 return None
 
@@ -882,10 +956,9 @@ def log_level_arg(value: str) -> str:
     """Argparse type for supported log levels."""
 
     normalized = value.strip().upper()
-    valid_levels = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-    if normalized not in valid_levels:
+    if normalized not in LOG_LEVELS:
         raise argparse.ArgumentTypeError(
-            f"value must be one of {', '.join(sorted(valid_levels))}"
+            f"value must be one of {', '.join(sorted(LOG_LEVELS))}"
         )
     return normalized
 
@@ -894,11 +967,9 @@ def bool_arg(value: str) -> bool:
     """Parse common boolean strings from environment variables."""
 
     normalized = value.strip().lower()
-    truthy = {"1", "true", "yes", "on"}
-    falsy = {"0", "false", "no", "off"}
-    if normalized in truthy:
+    if normalized in TRUTHY_STRINGS:
         return True
-    if normalized in falsy:
+    if normalized in FALSY_STRINGS:
         return False
     raise argparse.ArgumentTypeError("value must be a boolean-like string")
 